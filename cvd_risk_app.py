@@ -1,14 +1,23 @@
+import bisect
+import math
+from dataclasses import dataclass, replace
 import streamlit as st
 import numpy as np
 import pandas as pd
-import plotly.express as px
+import altair as alt
 from datetime import date
 
+try:
+    import numba
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
 # Configure page
 st.set_page_config(page_title="SMART-2 CVD Risk Calculator", layout="wide")
 
 # Custom CSS for better styling
-st.markdown("""
+CSS_BLOCK = """
 <style>
     .risk-high { background-color: #ffcccc; padding: 10px; border-radius: 5px; }
     .risk-medium { background-color: #fff3cd; padding: 10px; border-radius: 5px; }
@@ -16,7 +25,42 @@ st.markdown("""
     .header-box { border-bottom: 2px solid #0056b3; margin-top: 20px; }
     .stMetric { border: 1px solid #dee2e6; border-radius: 5px; padding: 15px; }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Section headers
+HEADER_PATIENT = '<div class="header-box"><h2>1. Patient Characteristics</h2></div>'
+HEADER_CLINICAL = '<div class="header-box"><h2>2. Clinical Markers</h2></div>'
+HEADER_TREATMENT = '<div class="header-box"><h2>3. Treatment Options</h2></div>'
+HEADER_RISK = '<div class="header-box"><h2>4. Risk Assessment</h2></div>'
+
+# Clinical recommendations, indexed by projected-risk band (%)
+_LOW_HTML = ('<div class="risk-low">'
+             '<h4>🟢 Moderate Risk</h4>'
+             '<ul>'
+             '<li>Maintain adherence to current therapies</li>'
+             '<li>Focus on lifestyle interventions</li>'
+             '<li>Annual risk reassessment</li>'
+             '</ul></div>')
+_MED_HTML = ('<div class="risk-medium">'
+             '<h4>🟠 High Risk</h4>'
+             '<ul>'
+             '<li>Optimize statin therapy (high-intensity preferred)</li>'
+             '<li>Target SBP <130 mmHg if tolerated</li>'
+             '<li>Address all modifiable risk factors</li>'
+             '</ul></div>')
+_HIGH_HTML = ('<div class="risk-high">'
+              '<h4>🔴 Very High Risk</h4>'
+              '<ul>'
+              '<li>Intensive lipid lowering (target LDL <1.4 mmol/L)</li>'
+              '<li>Consider PCSK9 inhibitor if LDL remains elevated</li>'
+              '<li>Multidisciplinary risk factor management</li>'
+              '</ul></div>')
+_RISK_THRESHOLDS = (20.0, 30.0)
+_RECS_HTML = (_LOW_HTML, _MED_HTML, _HIGH_HTML)
+
+# Streamlit drops elements not re-emitted on a rerun, so the style block
+# has to be sent every time; only the string itself is built once.
+st.markdown(CSS_BLOCK, unsafe_allow_html=True)
 
 # Evidence database with tooltips
 EVIDENCE = {
@@ -42,43 +86,200 @@ EVIDENCE = {
     }
 }
 
+# Pre-rendered tooltip and reference text (EVIDENCE is constant)
+_TOOLTIPS = {k: f"**Effect:** {v['effect']} | **Source:** {v['study']}" for k, v in EVIDENCE.items()}
+_EVIDENCE_MD_LINES = tuple(
+    f"🔹 **{v['study']}**: {v['effect']} | [Read study]({v['link']})" for v in EVIDENCE.values()
+)
+
 def create_evidence_tooltip(key):
     """Generate hover tooltip with study evidence"""
-    study = EVIDENCE.get(key, {})
-    if study:
-        return f"**Effect:** {study['effect']} | **Source:** {study['study']}"
-    return ""
+    return _TOOLTIPS.get(key, "")
+
+# Treatment effects (simplified model): relative risk reduction in %
+THERAPIES = pd.DataFrame({
+    "name": ["Moderate-intensity statin", "High-intensity statin", "Ezetimibe",
+             "PCSK9 inhibitor", "Intensive SBP target (<130 mmHg)"],
+    "rr": [25, 35, 6, 15, 15],
+    "group": ["statin_mod", "statin_high", "ezetimibe", "pcsk9", "bp"]
+})
+_THERAPY_RR = THERAPIES["rr"].to_numpy()
+# Selection bit for each therapy group, in table row order
+_THERAPY_BIT = {group: 1 << i for i, group in enumerate(THERAPIES["group"])}
+# Total RR reduction for every subset of therapies, indexed by selection bitmask
+_RR_TABLE = np.array([int(_THERAPY_RR[[(m >> i) & 1 == 1 for i in range(len(_THERAPY_RR))]].sum())
+                      for m in range(1 << len(_THERAPY_RR))], dtype=np.int32)
 
 # SMART-2 Risk Calculation
-def calculate_smart2_risk(age, sex, diabetes, smoker, egfr, vasc_count, ldl, sbp):
+# Coefficients: intercept, age, female, diabetes, smoker, egfr<30, egfr30-60,
+# polyvascular, ldl, sbp
+_SMART2_COEF = np.array([-8.1937, 0.0635, -0.3372, 0.5034, 0.7862,
+                         0.9235, 0.5539, 0.5434, 0.2436, 0.0083])
+
+# st.cache_data keys on a function's source and arguments, not on the module
+# globals it reads, so model parameters are passed into cached functions to
+# keep stale (and disk-persisted) risks from surviving a coefficient change
+_SMART2_COEF_KEY = tuple(_SMART2_COEF.tolist())
+_MODEL_KEY = (_SMART2_COEF_KEY, tuple(_RR_TABLE.tolist()))
+
+@dataclass(frozen=True, slots=True)
+class RiskProfile:
+    """Patient characteristics used by the SMART-2 model"""
+    age: int
+    sex: str
+    diabetes: bool
+    smoker: bool
+    egfr: int
+    vasc_count: int
+    ldl: float
+    sbp: int
+
+@dataclass(frozen=True, slots=True)
+class Inputs:
+    """Risk profile and selected treatments from the form"""
+    profile: RiskProfile
+    statin: str
+    ezetimibe: bool
+    pcsk9i: bool
+    sbp_target: int
+
+def quantize(profile):
+    """Round continuous fields to model precision so cache keys collide.
+
+    LDL is scored at 0.1 mmol/L, so e.g. 3.05 is scored as 3.0 or 3.1.
+    """
+    return replace(profile, age=int(profile.age), ldl=round(profile.ldl, 1),
+                   sbp=int(profile.sbp))
+
+def calculate_smart2_risk(profile):
     """Calculate 10-year recurrent CVD risk using SMART-2 model"""
-    coefficients = {
-        'intercept': -8.1937,
-        'age': 0.0635,
-        'female': -0.3372,
-        'diabetes': 0.5034,
-        'smoker': 0.7862,
-        'egfr<30': 0.9235 if egfr < 30 else 0,
-        'egfr30-60': 0.5539 if 30 <= egfr < 60 else 0,
-        'polyvascular': 0.5434 if vasc_count >= 2 else 0,
-        'ldl': 0.2436 * (ldl - 2.5),
-        'sbp': 0.0083 * (sbp - 120)
-    }
-    
-    lp = (coefficients['intercept'] + 
-          coefficients['age'] * (age - 60) + 
-          coefficients['female'] * (1 if sex == "Female" else 0) +
-          coefficients['diabetes'] * diabetes +
-          coefficients['smoker'] * smoker +
-          coefficients['egfr<30'] +
-          coefficients['egfr30-60'] +
-          coefficients['polyvascular'] +
-          coefficients['ldl'] +
-          coefficients['sbp'])
-    
-    risk_percent = 100 * (1 - np.exp(-np.exp(lp) * 10))
+    return _smart2_risk_cached(quantize(profile), _SMART2_COEF_KEY)
+
+@st.cache_data(persist="disk", max_entries=10_000)
+def _smart2_risk_cached(profile, coef):
+    """SMART-2 risk for a quantized profile, persisted across restarts"""
+    feats = np.array([
+        1.0,                                        # intercept
+        profile.age - 60,                           # age
+        1.0 if profile.sex == "Female" else 0.0,    # female
+        float(profile.diabetes),                    # diabetes
+        float(profile.smoker),                      # smoker
+        1.0 if profile.egfr < 30 else 0.0,          # egfr<30
+        1.0 if 30 <= profile.egfr < 60 else 0.0,    # egfr30-60
+        1.0 if profile.vasc_count >= 2 else 0.0,    # polyvascular
+        profile.ldl - 2.5,                          # ldl
+        profile.sbp - 120                           # sbp
+    ])
+    lp = float(np.asarray(coef) @ feats)
+
+    risk_percent = 100.0 * (1.0 - math.exp(-math.exp(lp) * 10.0))
     return round(risk_percent, 1)
 
+# Batch SMART-2 scoring for sensitivity sweeps / scenario grids
+if _NUMBA_AVAILABLE:
+    @numba.njit(cache=True, fastmath=True)
+    def smart2_risk_batch(age, sex_female, diabetes, smoker, egfr, vasc_count, ldl, sbp):
+        """Vectorised SMART-2 risk (%) over 1-D arrays of patient characteristics"""
+        n = age.shape[0]
+        out = np.empty(n)
+        for i in range(n):
+            lp = (_SMART2_COEF[0] +
+                  _SMART2_COEF[1] * (age[i] - 60) +
+                  _SMART2_COEF[2] * sex_female[i] +
+                  _SMART2_COEF[3] * diabetes[i] +
+                  _SMART2_COEF[4] * smoker[i] +
+                  (_SMART2_COEF[5] if egfr[i] < 30 else 0.0) +
+                  (_SMART2_COEF[6] if 30 <= egfr[i] < 60 else 0.0) +
+                  (_SMART2_COEF[7] if vasc_count[i] >= 2 else 0.0) +
+                  _SMART2_COEF[8] * (ldl[i] - 2.5) +
+                  _SMART2_COEF[9] * (sbp[i] - 120))
+            out[i] = 100.0 * (1.0 - math.exp(-math.exp(lp) * 10.0))
+        return out
+else:
+    def smart2_risk_batch(age, sex_female, diabetes, smoker, egfr, vasc_count, ldl, sbp):
+        """Vectorised SMART-2 risk (%) over 1-D arrays of patient characteristics"""
+        feats = np.stack([
+            np.ones(age.shape[0]),
+            age - 60,
+            sex_female,
+            diabetes,
+            smoker,
+            egfr < 30,
+            (30 <= egfr) & (egfr < 60),
+            vasc_count >= 2,
+            ldl - 2.5,
+            sbp - 120
+        ]).astype(np.float64)
+        lp = _SMART2_COEF @ feats
+        return 100.0 * (1.0 - np.exp(-np.exp(lp) * 10.0))
+
+@st.cache_resource
+def _warmup_smart2_batch():
+    """Compile the batch kernel once per process so users don't pay JIT cost"""
+    one = np.ones(1)
+    smart2_risk_batch(one * 65, one, one, one, one * 60, one * 2, one * 3.0, one * 140)
+    return True
+
+def compute_projected_risk(inputs, baseline_risk):
+    """Apply treatment effects (simplified model) to the baseline risk"""
+    selected = {
+        "statin_mod": inputs.statin == "Moderate",
+        "statin_high": inputs.statin == "High",
+        "ezetimibe": inputs.ezetimibe,
+        "pcsk9": inputs.pcsk9i,
+        "bp": inputs.sbp_target < 130
+    }
+    mask = 0
+    for group, on in selected.items():
+        if on:
+            mask |= _THERAPY_BIT[group]
+    rr_reduction = int(_RR_TABLE[mask])
+
+    projected_risk = baseline_risk * (1 - rr_reduction/100)
+    return rr_reduction, projected_risk
+
+@st.cache_data(max_entries=512)
+def pipeline(inputs, model_key):
+    """Baseline risk, projected risk and % RR reduction for one patient
+
+    model_key is not read; it ties cache entries to the current model parameters.
+    """
+    baseline_risk = calculate_smart2_risk(inputs.profile)
+    rr_reduction, projected_risk = compute_projected_risk(inputs, baseline_risk)
+    return baseline_risk, projected_risk, rr_reduction
+
+@st.cache_data
+def compute_bmi(weight: float, height: float) -> float:
+    """Body mass index (kg/m²) from weight in kg and height in cm"""
+    return round(weight / ((height/100.0)**2), 1)
+
+_warmup_smart2_batch()
+
+@st.cache_data
+def build_risk_chart(baseline_risk, projected_risk):
+    """Bar chart comparing baseline and projected 10-year risk"""
+    risk_data = alt.Data(values=[
+        {"scenario": "Baseline", "risk": baseline_risk},
+        {"scenario": "With Interventions", "risk": projected_risk}
+    ])
+    base = alt.Chart(risk_data).encode(
+        x=alt.X("scenario:N", title="", sort=None),
+        y=alt.Y("risk:Q", title="10-Year Risk (%)")
+    )
+    bars = base.mark_bar().encode(
+        color=alt.Color("scenario:N", legend=None,
+                        scale=alt.Scale(range=["#ff5a5f", "#25a55f"]))
+    )
+    labels = base.transform_calculate(
+        label="format(datum.risk, '.1f') + '%'"
+    ).mark_text(dy=-8).encode(text="label:N")
+    return (bars + labels).properties(height=300)
+
+@st.cache_data(ttl=86400)
+def today_str():
+    """Current date (YYYY-MM-DD), refreshed at most once a day"""
+    return date.today().isoformat()
+
 # App Header
 st.title("SMART-2 Recurrent CVD Risk Calculator")
 st.markdown("""
@@ -88,156 +289,130 @@ st.markdown("""
 """)
 
 # 1. PATIENT DEMOGRAPHICS ----------------------------------
-st.markdown('<div class="header-box"><h2>1. Patient Characteristics</h2></div>', unsafe_allow_html=True)
+st.markdown(HEADER_PATIENT, unsafe_allow_html=True)
 
+# Body measurements sit outside the form so the BMI readout stays live
 col1, col2, col3 = st.columns(3)
 with col1:
-    age = st.number_input("Age (years)", min_value=30, max_value=90, value=65, step=1)
-    sex = st.radio("Sex", ["Male", "Female"])
-    
-with col2:
-    diabetes = st.checkbox("Diabetes mellitus")
-    smoker = st.checkbox("Current smoker", help=create_evidence_tooltip("smoking"))
-    
-with col3:
     weight = st.number_input("Weight (kg)", min_value=40.0, max_value=200.0, value=75.0, step=0.1)
+with col2:
     height = st.number_input("Height (cm)", min_value=140.0, max_value=210.0, value=170.0, step=0.1)
-    bmi = round(weight / ((height/100)**2, 1))
+with col3:
+    bmi = compute_bmi(weight, height)
     st.markdown(f"**BMI:** {bmi} kg/m²")
 
-# 2. CLINICAL MARKERS --------------------------------------
-st.markdown('<div class="header-box"><h2>2. Clinical Markers</h2></div>', unsafe_allow_html=True)
-
-tab1, tab2 = st.tabs(["Laboratory Values", "Vascular History"])
-with tab1:
+# Risk model inputs are batched in a form so the app reruns once per submission
+with st.form("cvd_inputs"):
     col1, col2 = st.columns(2)
     with col1:
-        ldl = st.number_input("LDL-C (mmol/L)", min_value=0.5, max_value=6.0, value=3.0, step=0.1,
-                             help=create_evidence_tooltip("ldl"))
-        hdl = st.number_input("HDL-C (mmol/L)", min_value=0.5, max_value=3.0, value=1.3, step=0.1)
+        age = st.number_input("Age (years)", min_value=30, max_value=90, value=65, step=1)
+        sex = st.radio("Sex", ["Male", "Female"])
+
     with col2:
-        sbp = st.number_input("Systolic BP (mmHg)", min_value=80, max_value=220, value=140, step=1,
-                             help=create_evidence_tooltip("sbp"))
-        egfr = st.slider("eGFR (mL/min/1.73m²)", min_value=15, max_value=120, value=60)
+        diabetes = st.checkbox("Diabetes mellitus")
+        smoker = st.checkbox("Current smoker", help=create_evidence_tooltip("smoking"))
 
-with tab2:
-    vasc_cor = st.checkbox("Coronary artery disease")
-    vasc_cer = st.checkbox("Cerebrovascular disease")
-    vasc_per = st.checkbox("Peripheral artery disease")
-    vasc_count = sum([vasc_cor, vasc_cer, vasc_per])
+    # 2. CLINICAL MARKERS --------------------------------------
+    st.markdown(HEADER_CLINICAL, unsafe_allow_html=True)
 
-# 3. TREATMENT OPTIONS -------------------------------------
-st.markdown('<div class="header-box"><h2>3. Treatment Options</h2></div>', unsafe_allow_html=True)
+    tab1, tab2 = st.tabs(["Laboratory Values", "Vascular History"])
+    with tab1:
+        col1, col2 = st.columns(2)
+        with col1:
+            ldl = st.number_input("LDL-C (mmol/L)", min_value=0.5, max_value=6.0, value=3.0, step=0.1,
+                                 help=create_evidence_tooltip("ldl"))
+            hdl = st.number_input("HDL-C (mmol/L)", min_value=0.5, max_value=3.0, value=1.3, step=0.1)
+        with col2:
+            sbp = st.number_input("Systolic BP (mmHg)", min_value=80, max_value=220, value=140, step=1,
+                                 help=create_evidence_tooltip("sbp"))
+            egfr = st.slider("eGFR (mL/min/1.73m²)", min_value=15, max_value=120, value=60)
 
-with st.expander("Lipid-Lowering Therapy", expanded=True):
-    col1, col2 = st.columns(2)
-    with col1:
-        statin = st.radio("Statin intensity", ["None", "Moderate", "High"],
-                         help=create_evidence_tooltip("statin_high"))
-    with col2:
-        ezetimibe = st.checkbox("Ezetimibe 10mg daily")
-        pcsk9i = st.checkbox("PCSK9 inhibitor", disabled=ldl < 1.8)
+    with tab2:
+        vasc_cor = st.checkbox("Coronary artery disease")
+        vasc_cer = st.checkbox("Cerebrovascular disease")
+        vasc_per = st.checkbox("Peripheral artery disease")
+        vasc_count = int(vasc_cor) + int(vasc_cer) + int(vasc_per)
+
+    # 3. TREATMENT OPTIONS -------------------------------------
+    st.markdown(HEADER_TREATMENT, unsafe_allow_html=True)
+    st.caption("PCSK9 inhibitor availability and the smoking cessation option follow "
+               "the last submitted LDL-C and smoking status. A PCSK9 inhibitor is only "
+               "counted when the submitted LDL-C is at least 1.8 mmol/L.")
+
+    with st.expander("Lipid-Lowering Therapy", expanded=True):
+        col1, col2 = st.columns(2)
+        with col1:
+            statin = st.radio("Statin intensity", ["None", "Moderate", "High"],
+                             help=create_evidence_tooltip("statin_high"))
+        with col2:
+            ezetimibe = st.checkbox("Ezetimibe 10mg daily")
+            pcsk9i = st.checkbox("PCSK9 inhibitor", disabled=ldl < 1.8)
 
-with st.expander("Blood Pressure Management"):
-    sbp_target = st.slider("Target SBP (mmHg)", 80, 220, 130, help="SPRINT trial target")
-    st.checkbox("ACE inhibitor/ARB")
-    st.checkbox("Calcium channel blocker")
+    with st.expander("Blood Pressure Management"):
+        sbp_target = st.slider("Target SBP (mmHg)", 80, 220, 130, help="SPRINT trial target")
+        st.checkbox("ACE inhibitor/ARB")
+        st.checkbox("Calcium channel blocker")
 
-with st.expander("Lifestyle Interventions"):
-    st.checkbox("Mediterranean diet")
-    st.checkbox("Regular exercise (150 min/week)")
-    if smoker:
-        st.checkbox("Smoking cessation program")
+    with st.expander("Lifestyle Interventions"):
+        st.checkbox("Mediterranean diet")
+        st.checkbox("Regular exercise (150 min/week)")
+        if smoker:
+            st.checkbox("Smoking cessation program")
+
+    submitted = st.form_submit_button("Calculate risk")
 
 # 4. RISK CALCULATION & RESULTS ----------------------------
-st.markdown('<div class="header-box"><h2>4. Risk Assessment</h2></div>', unsafe_allow_html=True)
+st.markdown(HEADER_RISK, unsafe_allow_html=True)
 
 # Calculate risks
-baseline_risk = calculate_smart2_risk(age, sex, diabetes, smoker, egfr, vasc_count, ldl, sbp)
-
-# Apply treatment effects (simplified model)
-rr_reduction = 0
-if statin == "Moderate":
-    rr_reduction += 25
-elif statin == "High":
-    rr_reduction += 35
-if ezetimibe:
-    rr_reduction += 6
-if pcsk9i:
-    rr_reduction += 15
-if sbp_target < 130:
-    rr_reduction += 15
-
-projected_risk = baseline_risk * (1 - rr_reduction/100)
-
-# Display metrics
-col1, col2 = st.columns(2)
-with col1:
-    st.metric(
-        label="Baseline 10-Year Risk",
-        value=f"{baseline_risk}%",
-        help="Untreated risk of recurrent CVD event"
-    )
-    
-with col2:
-    st.metric(
-        label="Projected Risk with Treatments",
-        value=f"{projected_risk:.1f}%",
-        delta=f"-{baseline_risk - projected_risk:.1f}%",
-        delta_color="inverse",
-        help=f"Estimated {rr_reduction}% relative risk reduction"
-    )
+if submitted:
+    profile = RiskProfile(age=age, sex=sex, diabetes=diabetes, smoker=smoker,
+                          egfr=egfr, vasc_count=vasc_count, ldl=ldl, sbp=sbp)
+    # The checkbox's disabled state lags the form, so enforce eligibility here
+    inp = Inputs(profile=profile, statin=statin, ezetimibe=ezetimibe,
+                 pcsk9i=pcsk9i and ldl >= 1.8, sbp_target=sbp_target)
+    st.session_state["result"] = pipeline(inp, _MODEL_KEY)
 
-# Risk trend visualization
-risk_data = pd.DataFrame({
-    "Scenario": ["Baseline", "With Interventions"],
-    "Risk (%)": [baseline_risk, projected_risk],
-    "Color": ["#ff5a5f", "#25a55f"]
-})
+if "result" in st.session_state:
+    baseline_risk, projected_risk, rr_reduction = st.session_state["result"]
 
-fig = px.bar(risk_data, x="Scenario", y="Risk (%)", color="Color", 
-             color_discrete_map={"#ff5a5f": "#ff5a5f", "#25a55f": "#25a55f"},
-             text="Risk (%)", height=300)
-fig.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
-fig.update_layout(showlegend=False, xaxis_title="", yaxis_title="10-Year Risk (%)")
-st.plotly_chart(fig, use_container_width=True)
-
-# Clinical recommendations
-st.markdown("### Clinical Recommendations")
-if projected_risk > 30:
-    st.markdown('<div class="risk-high">'
-               '<h4>🔴 Very High Risk</h4>'
-               '<ul>'
-               '<li>Intensive lipid lowering (target LDL <1.4 mmol/L)</li>'
-               '<li>Consider PCSK9 inhibitor if LDL remains elevated</li>'
-               '<li>Multidisciplinary risk factor management</li>'
-               '</ul></div>', unsafe_allow_html=True)
-elif projected_risk > 20:
-    st.markdown('<div class="risk-medium">'
-               '<h4>🟠 High Risk</h4>'
-               '<ul>'
-               '<li>Optimize statin therapy (high-intensity preferred)</li>'
-               '<li>Target SBP <130 mmHg if tolerated</li>'
-               '<li>Address all modifiable risk factors</li>'
-               '</ul></div>', unsafe_allow_html=True)
+    # Display metrics
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric(
+            label="Baseline 10-Year Risk",
+            value=f"{baseline_risk}%",
+            help="Untreated risk of recurrent CVD event"
+        )
+
+    with col2:
+        st.metric(
+            label="Projected Risk with Treatments",
+            value=f"{projected_risk:.1f}%",
+            delta=f"-{baseline_risk - projected_risk:.1f}%",
+            delta_color="inverse",
+            help=f"Estimated {rr_reduction}% relative risk reduction"
+        )
+
+    # Risk trend visualization
+    st.altair_chart(build_risk_chart(baseline_risk, projected_risk), use_container_width=True)
+
+    # Clinical recommendations
+    st.markdown("### Clinical Recommendations")
+    st.markdown(_RECS_HTML[bisect.bisect_left(_RISK_THRESHOLDS, projected_risk)],
+                unsafe_allow_html=True)
 else:
-    st.markdown('<div class="risk-low">'
-               '<h4>🟢 Moderate Risk</h4>'
-               '<ul>'
-               '<li>Maintain adherence to current therapies</li>'
-               '<li>Focus on lifestyle interventions</li>'
-               '<li>Annual risk reassessment</li>'
-               '</ul></div>', unsafe_allow_html=True)
+    st.info("Enter patient details above and press **Calculate risk**.")
 
 # References
 st.markdown("---")
 with st.expander("Evidence References"):
-    for key, study in EVIDENCE.items():
-        st.markdown(f"🔹 **{study['study']}**: {study['effect']} | [Read study]({study['link']})")
+    for line in _EVIDENCE_MD_LINES:
+        st.markdown(line)
 
 # Footer
 st.markdown("---")
-st.markdown("""
+st.markdown(f"""
 *Developed for clinical use • Based on SMART-2 risk model • Not a substitute for clinical judgment*  
-*Version 1.0 • {date.today().strftime('%Y-%m-%d')}*
+*Version 1.0 • {today_str()}*
 """)